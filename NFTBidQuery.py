@@ -1,34 +1,95 @@
 import os
+import logging
+import sys
 from dotenv import load_dotenv
-import requests
+import asyncio
+import httpx
+import io
+import ijson
+import orjson
+import random
+import pickle
+from decimal import Decimal
 import psycopg2
-from datetime import datetime
-import schedule
-import time
+import psycopg2.pool
+from psycopg2.extras import execute_values
+
+# uvloop is a faster drop-in event loop; it is not available on Windows
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Load the .env file
 load_dotenv()
 
-# Connect to the PostgreSQL database
+# Log through the logging module so DEBUG messages cost nothing unless LOG_LEVEL=DEBUG
+# LOG_LEVEL may be a level name in any case or a number; anything else falls back to INFO
+LOG_LEVEL = (os.getenv("LOG_LEVEL") or "INFO").strip().upper()
+_level = int(LOG_LEVEL) if LOG_LEVEL.isdigit() else logging.getLevelName(LOG_LEVEL)
+logging.basicConfig(level=_level if isinstance(_level, int) else logging.INFO, format="[%(levelname)s] %(message)s", stream=sys.stdout)
+log = logging.getLogger(__name__)
+if not isinstance(_level, int):
+    log.warning("Unknown LOG_LEVEL %r, using INFO.", LOG_LEVEL)
+
+# OpenSea request headers, built once; the script cannot do anything without an API key
+if not os.getenv("OPENSEA_API_KEY"):
+    log.error("OPENSEA_API_KEY is not set.")
+    exit(1)
+HEADERS = {"accept": "application/json", "X-API-KEY": os.environ["OPENSEA_API_KEY"]}
+
+# Collections to track, deduplicated at load time while keeping their order
+COLLECTIONS = tuple(dict.fromkeys([
+    "pridepunks2018", "meebits", "official-v1-punks", "the-blocks-of-art-by-shvembldr",
+    "watercolor-dreams-by-numbersinmotion", "rituals-venice-by-aaron-penne-x-boreta",
+    "aerial-view-by-dalenz", "blockbob-rorschach-by-eboy", "timepiece-by-wawaa",
+    "mirage-gallery-dreamers", "friendship-bracelets-by-alexis-andre", "meekicks",
+    "easy-peasy", "spiromorphs-by-sab", "dot-matrix-gradient-study-by-jake-rockland",
+    "patterns-of-life-by-vamoss", "time-squared-by-steen-x-n-e-o",
+    "spiroflakes-by-alexander-reben", "flowers-by-rvig",
+    "transitions-by-jason-ting-x-matt-bilfield", "talking-blocks-by-remo-x-dcsan",
+    "gizmobotz-by-mark-cotton", "octo-garden-by-rich-lord",
+    "spaghettification-by-owen-moore", "panelscape-a-b-by-paolo-tonon",
+    "inspirals-by-radix", "chromie-squiggle-by-snowfro", "color-study-by-jeff-davis",
+    "bitgans", "cryptoblots-by-daim-aggott-honsch", "apparitions-by-aaron-penne",
+    "unigrids-by-zeblocks"
+]))
+
+# Create a pool of connections to the PostgreSQL database
 def connect_db():
     try:
-        conn = psycopg2.connect(
+        pool = psycopg2.pool.SimpleConnectionPool(
+            1, 4,
             host=os.getenv("DB_HOST"),
             dbname=os.getenv("DB_NAME"),
             user=os.getenv("DB_USER"),
             password=os.getenv("DB_PASSWORD")
         )
-        print("Connection to PostgreSQL database successful.")
-        cur = conn.cursor()
-        cur.execute("SELECT NOW();")
-        result = cur.fetchone()
-        print(f"Current Timestamp from Database: {result[0]}")
-        cur.close()
-        return conn
+        log.info("Connection to PostgreSQL database successful.")
+        # The pool already opened a connection above, so the round-trip probe is only for debugging
+        if log.isEnabledFor(logging.DEBUG):
+            conn = pool.getconn()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT NOW();")
+                    result = cur.fetchone()
+                    log.debug("Current Timestamp from Database: %s", result[0])
+                conn.rollback()
+            finally:
+                pool.putconn(conn)
+        return pool
     except Exception as e:
-        print(f"[ERROR] Could not connect to the database: {e}")
+        log.error("Could not connect to the database: %s", e)
         exit(1)
 
+# Check a connection out of the pool
+def get_conn():
+    return POOL.getconn()
+
+# Return a connection to the pool, discarding it if the server dropped it while idle
+def put_conn(conn):
+    POOL.putconn(conn, close=bool(conn.closed))
+
 # Create the table if it doesn't exist
 def create_table(conn):
     try:
@@ -40,144 +101,330 @@ def create_table(conn):
                     highest_single_bid NUMERIC,
                     floor_price NUMERIC,
                     num_bids INT,
-                    last_updated TIMESTAMP,
+                    last_updated TIMESTAMP DEFAULT now(),
                     CONSTRAINT unique_collection_time UNIQUE (collection_name, last_updated)
                 );
             """)
+            # Serve "latest snapshot per collection" lookups from an index instead of a sort
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_nft_latest ON nft_data (collection_name, last_updated DESC);
+            """)
             conn.commit()
-            print("[INFO] Table created or already exists.")
+            log.info("Table and index created or already exist.")
     except Exception as e:
-        print(f"[ERROR] Could not create table: {e}")
+        conn.rollback()
+        log.error("Could not create table: %s", e)
 
-# Define a small tolerance for float comparison
-EPSILON = 1e-6
+    ensure_last_updated_default(conn)
 
-# Save data to the database
-def save_data(conn, collection, highest_bid, floor_price, num_bids):
-    data_changed = False
-    change_details = []
+# Tables created before last_updated had a default still need it, since inserts no longer send a timestamp
+def ensure_last_updated_default(conn):
     try:
         with conn.cursor() as cur:
-            # Fetch the most recent data for the collection from the database
             cur.execute("""
-                SELECT highest_single_bid, floor_price, num_bids 
-                FROM nft_data 
-                WHERE collection_name = %s 
-                ORDER BY last_updated DESC 
-                LIMIT 1;
-            """, (collection,))
+                SELECT column_default
+                FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = 'nft_data' AND column_name = 'last_updated';
+            """)
             result = cur.fetchone()
+            if result and result[0] == "now()":
+                conn.rollback()
+                return
 
-            # Unpack the existing data and convert to float for comparison
-            existing_bid, existing_floor, existing_num_bids = None, None, 0
-            if result:
-                existing_bid = float(result[0]) if result[0] is not None else None
-                existing_floor = float(result[1]) if result[1] is not None else None
-                existing_num_bids = int(result[2]) if result[2] is not None else 0
-                print(f"[DEBUG] Existing data for {collection}: Highest Bid: {existing_bid}, Floor Price: {existing_floor}, Num Bids: {existing_num_bids}")
-            else:
-                print(f"[DEBUG] No existing data for {collection}, adding initial data.")
+            # Altering the table requires owning it, which is why this only runs when the default is missing
+            cur.execute("""
+                ALTER TABLE nft_data ALTER COLUMN last_updated SET DEFAULT now();
+            """)
+            conn.commit()
+            log.info("Added now() default to nft_data.last_updated.")
+    except Exception as e:
+        conn.rollback()
+        log.error("Could not set a default for nft_data.last_updated, new rows would have no timestamp: %s", e)
+        exit(1)
 
-            # Set default for num_bids if it is None
-            if num_bids is None:
-                num_bids = 0
+# Fetch the most recent snapshot of every collection in a single query
+def fetch_latest(cur, collections):
+    cur.execute("""
+        SELECT DISTINCT ON (collection_name) collection_name, highest_single_bid, floor_price, num_bids
+        FROM nft_data
+        WHERE collection_name = ANY(%s)
+        ORDER BY collection_name, last_updated DESC;
+    """, (list(collections),))
+    return {row[0]: row[1:] for row in cur.fetchall()}
+
+# Open the connection pool once, make sure the table exists and load the latest snapshots before the first run.
+# This process is the only writer, so LATEST stays in sync by writing through on every insert.
+POOL = connect_db()
+_conn = POOL.getconn()
+try:
+    create_table(_conn)
+    with _conn.cursor() as _cur:
+        LATEST = fetch_latest(_cur, COLLECTIONS)
+    _conn.rollback()
+finally:
+    POOL.putconn(_conn)
+
+# Compare fresh data for a collection against its latest stored snapshot
+def detect_change(collection, result, highest_bid, floor_price, num_bids):
+    data_changed = False
+    change_details = []
 
-            # Determine if a change has occurred
-            if existing_bid is None and existing_floor is None and existing_num_bids == 0:
-                data_changed = True  # First snapshot, always insert
-                change_details.append("Initial snapshot added.")
+    # Unpack the existing data; NUMERIC columns come back as Decimal and compare exactly
+    existing_bid, existing_floor, existing_num_bids = None, None, 0
+    if result:
+        existing_bid, existing_floor = result[0], result[1]
+        existing_num_bids = int(result[2]) if result[2] is not None else 0
+        log.debug("Existing data for %s: Highest Bid: %s, Floor Price: %s, Num Bids: %s", collection, existing_bid, existing_floor, existing_num_bids)
+    else:
+        log.debug("No existing data for %s, adding initial data.", collection)
+
+    # Determine if a change has occurred
+    if existing_bid is None and existing_floor is None and existing_num_bids == 0:
+        data_changed = True  # First snapshot, always insert
+        change_details.append("Initial snapshot added.")
+    else:
+        bid_changed = (highest_bid is not None and highest_bid != existing_bid)
+        floor_changed = (floor_price is not None and floor_price != existing_floor)
+        num_bids_changed = (num_bids != existing_num_bids)
+
+        # A missing stored value has nothing to diff against, so only report the new one
+        if bid_changed:
+            if existing_bid is None:
+                change_details.append(f"Highest Bid set to {highest_bid:.6f} WETH")
             else:
-                # Use tolerance for floating-point comparisons
-                bid_changed = (highest_bid is not None and abs(highest_bid - existing_bid) > EPSILON)
-                floor_changed = (floor_price is not None and abs(floor_price - existing_floor) > EPSILON)
-                num_bids_changed = (num_bids != existing_num_bids)
-
-                if bid_changed:
-                    bid_diff = highest_bid - existing_bid
-                    change_details.append(f"Highest Bid changed by {bid_diff:.6f} WETH (New: {highest_bid:.6f} WETH)")
-                    data_changed = True
-
-                if floor_changed:
-                    floor_diff = floor_price - existing_floor
-                    change_details.append(f"Floor Price changed by {floor_diff:.6f} WETH (New: {floor_price:.6f} WETH)")
-                    data_changed = True
-
-                if num_bids_changed:
-                    bids_diff = num_bids - existing_num_bids
-                    change_details.append(f"Number of Bids changed by {bids_diff} (New: {num_bids})")
-                    data_changed = True
-
-            # Insert new data if there's a change
-            if data_changed:
-                cur.execute("""
-                    INSERT INTO nft_data (collection_name, highest_single_bid, floor_price, num_bids, last_updated)
-                    VALUES (%s, %s, %s, %s, %s);
-                """, (collection, highest_bid, floor_price, num_bids, datetime.now()))
-                conn.commit()
-                print(f"[INFO] New data point added for {collection}.")
+                bid_diff = highest_bid - existing_bid
+                change_details.append(f"Highest Bid changed by {bid_diff:.6f} WETH (New: {highest_bid:.6f} WETH)")
+            data_changed = True
+
+        if floor_changed:
+            if existing_floor is None:
+                change_details.append(f"Floor Price set to {floor_price:.6f} WETH")
             else:
-                print(f"[INFO] No change for {collection}, not adding new data.")
+                floor_diff = floor_price - existing_floor
+                change_details.append(f"Floor Price changed by {floor_diff:.6f} WETH (New: {floor_price:.6f} WETH)")
+            data_changed = True
 
-    except Exception as e:
-        print(f"[ERROR] Could not save data for {collection}: {e}")
+        if num_bids_changed:
+            bids_diff = num_bids - existing_num_bids
+            change_details.append(f"Number of Bids changed by {bids_diff} (New: {num_bids})")
+            data_changed = True
 
     return data_changed, ", ".join(change_details)
 
-# Convert Wei to WETH
-def wei_to_weth(wei_value, decimals=18):
-    return int(wei_value) / (10 ** decimals)
+# Insert snapshots in one statement, retrying once on a fresh connection if the pooled one was dropped while idle
+def insert_snapshots(changes):
+    for attempt in range(2):
+        conn = get_conn()
+        try:
+            with conn.cursor() as cur:
+                # last_updated defaults to now(), so the whole batch shares one transaction timestamp
+                execute_values(cur, """
+                    INSERT INTO nft_data (collection_name, highest_single_bid, floor_price, num_bids)
+                    VALUES %s;
+                """, changes)
+            conn.commit()
+            return
+        except Exception as e:
+            if not conn.closed:
+                conn.rollback()
+            elif attempt == 0:
+                log.info("Database connection was closed (%s), retrying on a fresh connection.", e)
+                continue
+            raise
+        finally:
+            put_conn(conn)
+
+# Save data to the database, returning (collection, data_changed, change_details, saved) for every row
+def save_data(rows):
+    results = []
+    changes = []
+    for collection, highest_bid, floor_price, num_bids in rows:
+        # Set default for num_bids if it is None
+        if num_bids is None:
+            num_bids = 0
+
+        # Compare against the in-process snapshot instead of querying the database
+        try:
+            data_changed, change_details = detect_change(collection, LATEST.get(collection), highest_bid, floor_price, num_bids)
+        except Exception as e:
+            log.error("Could not save data for %s: %s", collection, e)
+            data_changed, change_details = False, ""
+
+        if data_changed:
+            changes.append((collection, highest_bid, floor_price, num_bids))
+        results.append((collection, data_changed, change_details))
+
+    # Insert every changed collection in one statement; unchanged runs never touch the database
+    saved = True
+    if changes:
+        try:
+            insert_snapshots(changes)
+        except Exception as e:
+            log.error("Could not save data: %s", e)
+            saved = False
+        else:
+            # Write through only once the insert is committed
+            for collection, highest_bid, floor_price, num_bids in changes:
+                LATEST[collection] = (highest_bid, floor_price, num_bids)
+
+    for collection, data_changed, _ in results:
+        if not data_changed:
+            log.info("No change for %s, not adding new data.", collection)
+        elif saved:
+            log.info("New data point added for %s.", collection)
+        else:
+            log.error("Change for %s was not saved.", collection)
+
+    return [(collection, data_changed, change_details, saved) for collection, data_changed, change_details in results]
+
+# WETH has 18 decimals
+WETH_DIVISOR = Decimal(10) ** 18
+
+# Convert Wei to WETH exactly
+def wei_to_weth(wei_value):
+    return Decimal(wei_value) / WETH_DIVISOR
 
 # Truncate collection names to a maximum of 30 characters
 def truncate_name(name, max_length=30):
     return name[:max_length] + "..." if len(name) > max_length else name
 
+# Limit concurrent OpenSea requests and retry rate-limited or failed ones
+MAX_CONCURRENT_REQUESTS = 16
+MAX_RETRIES = 5
+SEM = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+# Shared HTTP/2 client; all requests multiplex over its pooled connections for the lifetime of the process
+CLIENT = httpx.AsyncClient(
+    http2=True,
+    follow_redirects=True,
+    headers=HEADERS,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    timeout=10.0
+)
+
+# Cache of url -> (ETag, derived values) so unchanged responses are not downloaded and parsed again
+HTTP_CACHE_FILE = os.getenv("HTTP_CACHE_FILE", "http_cache.pkl")
+# Bump whenever the cached values change type; version 2 stores WETH amounts as Decimal
+HTTP_CACHE_VERSION = 2
+NOT_MODIFIED = object()
+
+# Load the ETag cache persisted by a previous run of the script
+def load_etag_cache():
+    try:
+        with open(HTTP_CACHE_FILE, "rb") as f:
+            cache = pickle.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        log.error("Could not load HTTP cache, starting empty: %s", e)
+        return {}
+
+    # Older caches hold float amounts, which break comparisons against Decimal snapshots
+    if not isinstance(cache, dict) or cache.get("version") != HTTP_CACHE_VERSION:
+        log.info("Discarding HTTP cache from an older format.")
+        return {}
+    return cache["entries"]
+
+# Persist the ETag cache so it survives process restarts
+def save_etag_cache():
+    try:
+        with open(HTTP_CACHE_FILE, "wb") as f:
+            pickle.dump({"version": HTTP_CACHE_VERSION, "entries": ETAG_CACHE}, f)
+    except Exception as e:
+        log.error("Could not save HTTP cache: %s", e)
+
+ETAG_CACHE = load_etag_cache()
+
+# Remember the derived values of a response under its ETag
+def cache_response(url, etag, values):
+    if etag:
+        ETAG_CACHE[url] = (etag, values)
+
+# Fetch a URL and return (raw body, ETag), (NOT_MODIFIED, ETag) on a 304, or (None, None) if every attempt failed
+async def fetch_body(url, etag=None):
+    headers = {"If-None-Match": etag} if etag else None
+    async with SEM:
+        for attempt in range(MAX_RETRIES):
+            delay = 2 ** attempt + random.random()
+            try:
+                response = await CLIENT.get(url, headers=headers)
+                if response.status_code == 304:
+                    return NOT_MODIFIED, etag
+
+                if response.status_code == 200:
+                    return response.content, response.headers.get("ETag")
+
+                if response.status_code != 429 and response.status_code < 500:
+                    log.error("Failed to fetch %s: %s - %s", url, response.status_code, response.text)
+                    return None, None
+
+                # Honour Retry-After when OpenSea sends it, otherwise back off exponentially
+                retry_after = response.headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    delay = float(retry_after)
+                log.info("%s returned %s, retrying in %.1fs (attempt %d/%d)", url, response.status_code, delay, attempt + 1, MAX_RETRIES)
+            except httpx.TransportError as e:
+                log.info("Request to %s failed (%s), retrying in %.1fs (attempt %d/%d)", url, e, delay, attempt + 1, MAX_RETRIES)
+
+            if attempt + 1 < MAX_RETRIES:
+                await asyncio.sleep(delay)
+
+    log.error("Giving up on %s after %d attempts", url, MAX_RETRIES)
+    return None, None
+
 # Get the highest single bid and count
-def get_highest_single_bid_and_count(collection_slug):
+async def get_highest_single_bid_and_count(collection_slug):
     url = f"https://api.opensea.io/api/v2/offers/collection/{collection_slug}"
     try:
-        response = requests.get(url, headers={"accept": "application/json", "X-API-KEY": os.getenv("OPENSEA_API_KEY")})
-        if response.status_code != 200:
-            print(f"[ERROR] {collection_slug} - Failed to fetch offers: {response.status_code} - {response.text}")
+        cached = ETAG_CACHE.get(url)
+        body, etag = await fetch_body(url, cached[0] if cached else None)
+        if body is NOT_MODIFIED:
+            return cached[1]
+        if body is None:
+            log.error("%s - Failed to fetch offers", collection_slug)
             return None, 0
 
-        offers_data = response.json().get("offers", [])
-        if not offers_data:
-            print(f"[INFO] No offers found for {collection_slug}")
+        # Stream only the parameters of each offer and keep the one with the highest per-item bid
+        best_offer = max(
+            (
+                (int(params["offer"][0]["startAmount"]), int(params["consideration"][0]["startAmount"]))
+                for params in ijson.items(io.BytesIO(body), "offers.item.protocol_data.parameters")
+            ),
+            key=lambda offer: offer[0] / offer[1] if offer[1] > 0 else offer[0],
+            default=None
+        )
+        if best_offer is None:
+            log.info("No offers found for %s", collection_slug)
             return None, 0
 
-        highest_single_bid_value = 0
-        num_bids = 0
-
-        # Iterate through the offers to find the highest single bid and number of bids
-        for offer in offers_data:
-            start_amount_wei = int(offer["protocol_data"]["parameters"]["offer"][0]["startAmount"])
-            bid_count = int(offer["protocol_data"]["parameters"]["consideration"][0]["startAmount"])
-
-            total_weth_value = wei_to_weth(start_amount_wei)
-            single_bid_value = total_weth_value / bid_count if bid_count > 0 else total_weth_value
-
-            if single_bid_value > highest_single_bid_value:
-                highest_single_bid_value = single_bid_value
-                num_bids = bid_count
+        # Convert to WETH and split per item
+        start_amount_wei, num_bids = best_offer
+        highest_single_bid_value = wei_to_weth(start_amount_wei)
+        if num_bids > 0:
+            highest_single_bid_value /= num_bids
 
+        cache_response(url, etag, (highest_single_bid_value, num_bids))
         return highest_single_bid_value, num_bids
 
     except Exception as e:
-        print(f"[ERROR] An error occurred while fetching the highest single bid for {collection_slug}: {e}")
+        log.error("An error occurred while fetching the highest single bid for %s: %s", collection_slug, e)
         return None, 0
 
 # Get the floor price
-def get_floor_price(collection_slug):
+async def get_floor_price(collection_slug):
     url = f"https://api.opensea.io/api/v2/listings/collection/{collection_slug}/best"
     try:
-        response = requests.get(url, headers={"accept": "application/json", "X-API-KEY": os.getenv("OPENSEA_API_KEY")})
-        if response.status_code != 200:
-            print(f"[ERROR] {collection_slug} - Failed to fetch floor price: {response.status_code} - {response.text}")
+        cached = ETAG_CACHE.get(url)
+        body, etag = await fetch_body(url, cached[0] if cached else None)
+        if body is NOT_MODIFIED:
+            return cached[1]
+        if body is None:
+            log.error("%s - Failed to fetch floor price", collection_slug)
             return None
 
-        listings_data = response.json().get("listings", [])
+        listings_data = orjson.loads(body).get("listings", [])
         if not listings_data:
-            print(f"[INFO] No listings found for {collection_slug}")
+            log.info("No listings found for %s", collection_slug)
             return None
 
         floor_price = None
@@ -185,69 +432,63 @@ def get_floor_price(collection_slug):
             price_info = listing.get('price', {}).get('current', {})
             price_wei = price_info.get('value')
             if price_wei:
-                price_weth = wei_to_weth(int(price_wei))
+                price_weth = wei_to_weth(price_wei)
                 if floor_price is None or price_weth < floor_price:
                     floor_price = price_weth
 
+        cache_response(url, etag, floor_price)
         return floor_price if floor_price is not None else None
 
     except Exception as e:
-        print(f"[ERROR] An error occurred while fetching the floor price for {collection_slug}: {e}")
+        log.error("An error occurred while fetching the floor price for %s: %s", collection_slug, e)
         return None
 
+# Fetch bids and floor prices for all collections concurrently
+async def fetch_all(collections):
+    results = await asyncio.gather(*[
+        asyncio.gather(get_highest_single_bid_and_count(collection), get_floor_price(collection))
+        for collection in collections
+    ])
+    save_etag_cache()
+    return results
+
 # Global variables to track the number of updates and scheduler runs
 update_counter = 0
 scheduler_run_counter = 0
 
 # Main function that contains the current script logic
-def main_job():
+async def main_job():
     global update_counter, scheduler_run_counter
 
     # Increment the scheduler run counter
     scheduler_run_counter += 1
-    print(f"\n[INFO] Running scheduled job... (Run #{scheduler_run_counter})")
+    log.info("Running scheduled job... (Run #%d)", scheduler_run_counter)
 
     # Counter for updates in the current run
     current_run_updates = 0
 
-    # Connect to the database
-    conn = connect_db()
-    create_table(conn)
-
-    collections = [
-        "pridepunks2018", "meebits", "official-v1-punks", "the-blocks-of-art-by-shvembldr",
-        "watercolor-dreams-by-numbersinmotion", "rituals-venice-by-aaron-penne-x-boreta",
-        "aerial-view-by-dalenz", "blockbob-rorschach-by-eboy", "timepiece-by-wawaa",
-        "mirage-gallery-dreamers", "friendship-bracelets-by-alexis-andre", "meekicks",
-        "easy-peasy", "spiromorphs-by-sab", "dot-matrix-gradient-study-by-jake-rockland",
-        "patterns-of-life-by-vamoss", "time-squared-by-steen-x-n-e-o",
-        "spiroflakes-by-alexander-reben", "flowers-by-rvig",
-        "transitions-by-jason-ting-x-matt-bilfield", "talking-blocks-by-remo-x-dcsan",
-        "gizmobotz-by-mark-cotton", "octo-garden-by-rich-lord",
-        "spaghettification-by-owen-moore", "panelscape-a-b-by-paolo-tonon",
-        "inspirals-by-radix", "chromie-squiggle-by-snowfro", "color-study-by-jeff-davis",
-        "bitgans", "cryptoblots-by-daim-aggott-honsch", "apparitions-by-aaron-penne",
-        "unigrids-by-zeblocks"
-    ]
-
     changed_collections = []
+    unsaved_collections = []
     unchanged_collections = []
 
-    for collection in collections:
-        highest_bid, num_bids = get_highest_single_bid_and_count(collection)
-        floor_price = get_floor_price(collection)
+    # Fetch all collections at once instead of one request at a time
+    results = await fetch_all(COLLECTIONS)
 
-        # Check if there's a change and save accordingly
-        change_detected, change_details = save_data(conn, collection, highest_bid, floor_price, num_bids)
+    rows = [
+        (collection, highest_bid, floor_price, num_bids)
+        for collection, ((highest_bid, num_bids), floor_price) in zip(COLLECTIONS, results)
+    ]
 
-        if change_detected:
+    # Save the whole run in one batch
+    for collection, change_detected, change_details, saved in save_data(rows):
+        if change_detected and saved:
             changed_collections.append((collection, change_details))
             current_run_updates += 1
+        elif change_detected:
+            unsaved_collections.append((collection, change_details))
         else:
             unchanged_collections.append(collection)
 
-    conn.close()
-
     # Update the global update counter
     update_counter += current_run_updates
 
@@ -257,21 +498,45 @@ def main_job():
     for collection, details in changed_collections:
         print(f"{collection}: {details}")
 
+    if unsaved_collections:
+        print("\nNFTs with Changes Not Saved (database error):")
+        print("=" * 45)
+        for collection, details in unsaved_collections:
+            print(f"{collection}: {details}")
+
     print("\nNFTs without Changes:")
     print("=" * 23)
     for collection in unchanged_collections:
         print(f"{collection}")
 
     # Display the update counters
-    print(f"\n[INFO] Updates in current run: {current_run_updates}")
-    print(f"[INFO] Total updates since start: {update_counter}")
-    print(f"[INFO] Total scheduler runs: {scheduler_run_counter}")
-
-# Schedule the script to run every hour
-schedule.every(1).hours.do(main_job)
-
-# Keep the script running
-print("[INFO] Scheduler started. Script will run every hour.")
-while True:
-    schedule.run_pending()
-    time.sleep(1)
+    log.info("Updates in current run: %d", current_run_updates)
+    log.info("Total updates since start: %d", update_counter)
+    log.info("Total scheduler runs: %d", scheduler_run_counter)
+
+# Run a job every interval seconds, sleeping in between
+async def periodic(coro_fn, interval):
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        # One failed run must not stop the scheduler
+        try:
+            await coro_fn()
+        except Exception:
+            log.exception("Scheduled job failed, will retry next interval")
+        await asyncio.sleep(max(0, interval - (loop.time() - started)))
+
+# Run the job every hour and close the HTTP client on shutdown
+async def main():
+    try:
+        log.info("Scheduler started. Script will run every hour.")
+        await periodic(main_job, 3600)
+    finally:
+        await CLIENT.aclose()
+        POOL.closeall()
+
+if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())